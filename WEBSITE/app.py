@@ -1,9 +1,14 @@
-from flask import Flask, render_template, request, Response, session
+from flask import Flask, render_template, request, Response, session, redirect, url_for, jsonify
 import requests as req_lib
 from bs4 import BeautifulSoup
+from collections import deque
+from io import BytesIO
+from openpyxl import Workbook
+import threading
 import uuid
 import time
 import urllib3
+from ratelimit import RateLimiter, INTERACTIVE, BACKGROUND
 
 # Suppress SSL warnings since VTU cert chain is incomplete
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -108,6 +113,20 @@ user_sessions = {}
 # Store hidden Token values per user per semester
 user_tokens = {}
 
+# ==========================================
+# JOB MODE (multi-operator range scrapes)
+# ==========================================
+# Seconds an operator may hold a USN before it is requeued
+LEASE_TIMEOUT = 120
+# Failed (non-CAPTCHA) attempts before a USN is given up on
+MAX_ATTEMPTS = 3
+
+jobs = {}
+jobs_lock = threading.Lock()
+
+# Every request to results.vtu.ac.in goes through this one limiter
+vtu_limiter = RateLimiter()
+
 
 # ==========================================
 # EXTRACT RESULT (with subject mapping)
@@ -190,7 +209,7 @@ def extract_result(html, sem):
 # ==========================================
 # SESSION HELPERS
 # ==========================================
-def _create_session(index_url):
+def _create_session(index_url, priority=INTERACTIVE):
     """Create a requests.Session with browser headers, initialize VTU cookies,
     and extract the hidden Token from the index page."""
     s = req_lib.Session()
@@ -198,7 +217,8 @@ def _create_session(index_url):
     s.headers.update(BROWSER_HEADERS)
     vtu_token = ""
     try:
-        resp = s.get(index_url, headers={"Referer": "https://results.vtu.ac.in/"})
+        resp = vtu_limiter.call(s.get, index_url, priority=priority,
+                                headers={"Referer": "https://results.vtu.ac.in/"})
         soup = BeautifulSoup(resp.text, "html.parser")
         token_input = soup.find("input", {"name": "Token"})
         if token_input:
@@ -220,6 +240,160 @@ def get_or_create_sessions(token):
     return user_sessions[token]
 
 
+# ==========================================
+# JOB HELPERS
+# ==========================================
+def usn_range(start_usn, end_usn):
+    """Expand e.g. 1XX22CS001..1XX22CS120 into the list of USNs in between."""
+    prefix, end_prefix = start_usn[:-3], end_usn[:-3]
+    start, end = int(start_usn[-3:]), int(end_usn[-3:])
+    if prefix != end_prefix or end < start:
+        raise ValueError("USN range must share a prefix and end after it starts")
+    return [prefix + str(n).zfill(3) for n in range(start, end + 1)]
+
+
+def create_job(sem, usns):
+    job_id = uuid.uuid4().hex[:8]
+    job = {
+        "id": job_id,
+        "sem": sem,
+        "sem_key": f"sem{sem}",
+        "usns": usns,
+        "pending": deque(usns),
+        "leases": {},
+        "attempts": {},
+        "results": {},
+        "failed": {},
+        "created": time.time(),
+    }
+    with jobs_lock:
+        jobs[job_id] = job
+    return job
+
+
+def _expire_leases(job):
+    """Requeue USNs whose lease ran out. Caller must hold jobs_lock."""
+    now = time.time()
+    for lease_id, lease in list(job["leases"].items()):
+        if lease["expires"] < now:
+            del job["leases"][lease_id]
+            job["pending"].appendleft(lease["usn"])
+
+
+def lease_next(job):
+    """Hand the next pending USN to an operator with a fresh VTU session."""
+    with jobs_lock:
+        _expire_leases(job)
+        usn = None
+        while job["pending"]:
+            candidate = job["pending"].popleft()
+            # Skip duplicates left behind by requeues
+            if candidate not in job["results"] and candidate not in job["failed"]:
+                usn = candidate
+                break
+        if usn is None:
+            return None
+        lease_id = uuid.uuid4().hex
+        job["leases"][lease_id] = {
+            "usn": usn,
+            "session": None,
+            "vtu_token": "",
+            "expires": time.time() + LEASE_TIMEOUT,
+        }
+
+    # Network call happens outside the lock so other operators aren't blocked
+    s, vtu_token = _create_session(SEM_INDEX_URLS[job["sem_key"]], priority=BACKGROUND)
+    with jobs_lock:
+        lease = job["leases"].get(lease_id)
+        if lease is None:
+            return None
+        lease["session"] = s
+        lease["vtu_token"] = vtu_token
+    return lease_id, usn
+
+
+def held_lease(job, lease_id):
+    """Return (usn, seconds_left) if lease_id is still live, else None."""
+    with jobs_lock:
+        _expire_leases(job)
+        lease = job["leases"].get(lease_id)
+        if lease is None or lease["session"] is None:
+            return None
+        return lease["usn"], max(0, int(lease["expires"] - time.time()))
+
+
+def release_lease(job, lease_id):
+    """Give a USN back to the end of the queue (operator skipped it)."""
+    with jobs_lock:
+        lease = job["leases"].pop(lease_id, None)
+        if lease:
+            job["pending"].append(lease["usn"])
+
+
+def complete_lease(job, lease_id, captcha):
+    """Submit an operator's CAPTCHA answer and record the outcome.
+
+    Returns (usn, status) where status is one of
+    "saved", "bad_captcha", "no_such_usn", "retry", "failed" or "expired".
+    """
+    with jobs_lock:
+        lease = job["leases"].pop(lease_id, None)
+    if lease is None or lease["session"] is None:
+        return None, "expired"
+
+    usn = lease["usn"]
+    sem_key = job["sem_key"]
+    payload = {"Token": lease["vtu_token"], "lns": usn, "captchacode": captcha}
+    try:
+        response = vtu_limiter.call(lease["session"].post, SEM_RESULT_URLS[sem_key],
+                                    priority=BACKGROUND, data=payload,
+                                    headers={"Referer": SEM_INDEX_URLS[sem_key]})
+        html = response.text
+    except Exception:
+        html = ""
+
+    parsed = extract_result(html, job["sem"]) if html else None
+
+    with jobs_lock:
+        if parsed:
+            job["results"][usn] = parsed
+            return usn, "saved"
+        if "invalid captcha" in html.lower():
+            # Operator's mistake, not the USN's -- don't count it
+            job["pending"].appendleft(usn)
+            return usn, "bad_captcha"
+        if "seat number is not available" in html.lower():
+            # Gap in the range -- retrying would only burn more CAPTCHAs
+            job["failed"][usn] = "No such USN"
+            return usn, "no_such_usn"
+        job["attempts"][usn] = job["attempts"].get(usn, 0) + 1
+        if job["attempts"][usn] < MAX_ATTEMPTS:
+            job["pending"].append(usn)
+            return usn, "retry"
+        job["failed"][usn] = "No result after retries"
+        return usn, "failed"
+
+
+def job_progress(job):
+    with jobs_lock:
+        _expire_leases(job)
+        return {
+            "id": job["id"],
+            "sem": job["sem"],
+            "total": len(job["usns"]),
+            "saved": len(job["results"]),
+            "failed": len(job["failed"]),
+            "leased": len(job["leases"]),
+            "pending": len(set(job["pending"]) - set(job["results"]) - set(job["failed"])),
+            "in_progress": sorted(l["usn"] for l in job["leases"].values()),
+            "failed_usns": sorted(job["failed"]),
+            "recent": [
+                {"usn": r["usn"], "name": r["name"], "total": r["total"], "percentage": r["percentage"]}
+                for r in list(job["results"].values())[-10:]
+            ],
+        }
+
+
 # ==========================================
 # ROUTES
 # ==========================================
@@ -241,7 +415,8 @@ def captcha_image(sem_key):
     s = user_sessions[token][sem_key]
     index_url = SEM_INDEX_URLS.get(sem_key, "")
     captcha_with_ts = f"{CAPTCHA_URL}?_CAPTCHA&t={time.time()}"
-    resp = s.get(captcha_with_ts, headers={"Referer": index_url})
+    resp = vtu_limiter.call(s.get, captcha_with_ts, priority=INTERACTIVE,
+                            headers={"Referer": index_url})
 
     content_type = resp.headers.get("Content-Type", "image/png")
     return Response(resp.content, content_type=content_type,
@@ -262,7 +437,8 @@ def refresh_captcha(sem_key):
     user_tokens[token][sem_key] = vtu_token
 
     captcha_with_ts = f"{CAPTCHA_URL}?_CAPTCHA&t={time.time()}"
-    resp = s.get(captcha_with_ts, headers={"Referer": index_url})
+    resp = vtu_limiter.call(s.get, captcha_with_ts, priority=INTERACTIVE,
+                            headers={"Referer": index_url})
     content_type = resp.headers.get("Content-Type", "image/png")
     return Response(resp.content, content_type=content_type,
                     headers={"Cache-Control": "no-cache, no-store, must-revalidate"})
@@ -289,8 +465,8 @@ def submit():
         vtu_token = user_tokens.get(token, {}).get(sem_key, "")
         payload = {"Token": vtu_token, "lns": usn, "captchacode": captcha}
         result_url = SEM_RESULT_URLS[sem_key]
-        response = s.post(result_url, data=payload,
-                          headers={"Referer": SEM_INDEX_URLS[sem_key]})
+        response = vtu_limiter.call(s.post, result_url, priority=INTERACTIVE, data=payload,
+                                    headers={"Referer": SEM_INDEX_URLS[sem_key]})
 
         parsed = extract_result(response.text, str(i))
         results[sem_key] = parsed
@@ -302,5 +478,146 @@ def submit():
     return render_template("result.html", results=results, usn=usn)
 
 
+# ==========================================
+# JOB ROUTES
+# ==========================================
+@app.route("/jobs", methods=["GET", "POST"])
+def job_new():
+    """Admin form: start a range scrape that several operators work on."""
+    if request.method == "GET":
+        with jobs_lock:
+            existing = list(jobs.values())
+        return render_template("job_new.html", jobs=existing, error=None)
+
+    sem = request.form.get("sem", "").strip()
+    start_usn = request.form.get("start_usn", "").strip().upper()
+    end_usn = request.form.get("end_usn", "").strip().upper()
+    try:
+        if f"sem{sem}" not in SEM_INDEX_URLS:
+            raise ValueError("Invalid semester")
+        usns = usn_range(start_usn, end_usn)
+    except ValueError as e:
+        with jobs_lock:
+            existing = list(jobs.values())
+        return render_template("job_new.html", jobs=existing, error=str(e)), 400
+
+    job = create_job(sem, usns)
+    return redirect(url_for("job_status", job_id=job["id"]))
+
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if not job:
+        return "Job not found", 404
+    return render_template("job_status.html", job=job, progress=job_progress(job))
+
+
+@app.route("/jobs/<job_id>/progress")
+def job_progress_json(job_id):
+    job = jobs.get(job_id)
+    if not job:
+        return "Job not found", 404
+    return jsonify(job_progress(job))
+
+
+@app.route("/jobs/<job_id>/solve", methods=["GET", "POST"])
+def job_solve(job_id):
+    """Operator page: lease the next USN, show its CAPTCHA, submit the answer."""
+    job = jobs.get(job_id)
+    if not job:
+        return "Job not found", 404
+
+    # Remember each operator's lease so reloading the page doesn't strand it
+    lease_key = f"lease_{job_id}"
+    last_usn, last_status = None, None
+    if request.method == "GET":
+        held = held_lease(job, session.get(lease_key, ""))
+        if held:
+            usn, remaining = held
+            return render_template("job_solve.html", job=job, lease_id=session[lease_key], usn=usn,
+                                   last_usn=None, last_status=None,
+                                   lease_timeout=remaining, progress=job_progress(job))
+    else:
+        lease_id = request.form.get("lease_id", "")
+        if request.form.get("skip"):
+            release_lease(job, lease_id)
+        else:
+            captcha = request.form.get("captcha", "").strip()
+            last_usn, last_status = complete_lease(job, lease_id, captcha)
+
+    leased = lease_next(job)
+    if leased is None:
+        session.pop(lease_key, None)
+        return render_template("job_solve.html", job=job, lease_id=None, usn=None,
+                               last_usn=last_usn, last_status=last_status,
+                               progress=job_progress(job))
+
+    lease_id, usn = leased
+    session[lease_key] = lease_id
+    return render_template("job_solve.html", job=job, lease_id=lease_id, usn=usn,
+                           last_usn=last_usn, last_status=last_status,
+                           lease_timeout=LEASE_TIMEOUT, progress=job_progress(job))
+
+
+@app.route("/jobs/<job_id>/captcha/<lease_id>")
+def job_captcha(job_id, lease_id):
+    """Proxy the VTU CAPTCHA through the session bound to one lease."""
+    job = jobs.get(job_id)
+    lease = job["leases"].get(lease_id) if job else None
+    if not lease or lease["session"] is None:
+        return "Lease expired", 400
+
+    index_url = SEM_INDEX_URLS[job["sem_key"]]
+    captcha_with_ts = f"{CAPTCHA_URL}?_CAPTCHA&t={time.time()}"
+    resp = vtu_limiter.call(lease["session"].get, captcha_with_ts, priority=BACKGROUND,
+                            headers={"Referer": index_url})
+    content_type = resp.headers.get("Content-Type", "image/png")
+    return Response(resp.content, content_type=content_type,
+                    headers={"Cache-Control": "no-cache, no-store, must-revalidate"})
+
+
+@app.route("/jobs/<job_id>/export")
+def job_export(job_id):
+    """Download everything collected so far as an Excel sheet."""
+    job = jobs.get(job_id)
+    if not job:
+        return "Job not found", 404
+
+    subject_short = list(SEM_SUBJECT_MAPS[job["sem"]].values())
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["USN", "Student Name"] + subject_short + ["TOTAL", "PERCENTAGE"])
+
+    with jobs_lock:
+        results = dict(job["results"])
+    # Keep the sheet in range order regardless of who solved what first
+    for usn in job["usns"]:
+        data = results.get(usn)
+        if not data:
+            continue
+        marks = {s: "" for s in subject_short}
+        for subj in data["subjects"]:
+            if subj["short"] in marks:
+                marks[subj["short"]] = subj["total"]
+        ws.append([data["usn"], data["name"]] + list(marks.values())
+                  + [data["total"], data["percentage"]])
+
+    out = BytesIO()
+    wb.save(out)
+    return Response(out.getvalue(),
+                    content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    headers={"Content-Disposition": f"attachment; filename=VTU_Sem{job['sem']}_{job_id}.xlsx"})
+
+
+# ==========================================
+# LIMITER STATUS
+# ==========================================
+@app.route("/limiter")
+def limiter_status():
+    """Current upstream rate and how many calls are queued behind it."""
+    return jsonify(vtu_limiter.stats())
+
+
 if __name__ == "__main__":
     app.run(debug=True)
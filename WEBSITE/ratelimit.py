@@ -0,0 +1,110 @@
+import threading
+import time
+
+
+# ==========================================
+# PRIORITIES
+# ==========================================
+INTERACTIVE = 0   # a student waiting on /submit
+BACKGROUND = 1    # range scrapes, job mode, CLI fetches
+
+# VTU answers with these when it wants us to slow down
+THROTTLE_STATUSES = {403, 429}
+
+
+# ==========================================
+# ADAPTIVE TOKEN BUCKET
+# ==========================================
+class RateLimiter:
+    """Token bucket shared by every call to results.vtu.ac.in.
+
+    The refill rate adapts AIMD-style: each healthy response adds
+    `increase` requests/sec, while a 5xx, a connection error or a
+    response slower than `slow_latency` multiplies the rate by
+    `decrease`. Interactive callers are always served before
+    background ones.
+    """
+
+    def __init__(self, rate=2.0, min_rate=0.2, max_rate=10.0, burst=2,
+                 increase=0.1, decrease=0.5, slow_latency=5.0, cooldown=2.0):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_latency = slow_latency
+        # One bad burst should only halve the rate once
+        self.cooldown = cooldown
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self, priority=BACKGROUND):
+        """Block until a request may be sent."""
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    self._refill()
+                    blocked = priority == BACKGROUND and self._waiting[INTERACTIVE] > 0
+                    if self._tokens >= 1 and not blocked:
+                        self._tokens -= 1
+                        return
+                    if blocked:
+                        # Woken by notify_all once the interactive caller is through
+                        self._cond.wait(1.0)
+                    else:
+                        self._cond.wait(max(0.01, (1 - self._tokens) / self.rate))
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def record(self, latency, ok):
+        """Feed back one upstream call's outcome."""
+        with self._cond:
+            now = time.monotonic()
+            if not ok or latency > self.slow_latency:
+                if now - self._last_decrease >= self.cooldown:
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self._last_decrease = now
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def call(self, fn, *args, priority=BACKGROUND, **kwargs):
+        """Run fn(*args, **kwargs) under the limiter and record how it went.
+
+        A returned object with a `status_code` of 500 or more, or a 429/403
+        throttle response, counts as a failure; so does any exception,
+        which is re-raised.
+        """
+        self.acquire(priority)
+        start = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record(time.monotonic() - start, ok=False)
+            raise
+        status = getattr(result, "status_code", 200)
+        self.record(time.monotonic() - start,
+                    ok=status < 500 and status not in THROTTLE_STATUSES)
+        return result
+
+    def stats(self):
+        with self._cond:
+            self._refill()
+            return {
+                "rate": round(self.rate, 3),
+                "tokens": round(self._tokens, 3),
+                "queue_depth": sum(self._waiting.values()),
+                "interactive_waiting": self._waiting[INTERACTIVE],
+                "background_waiting": self._waiting[BACKGROUND],
+            }
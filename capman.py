@@ -1,11 +1,14 @@
 import os
-from selenium import webdriver
 from selenium.common.exceptions import UnexpectedAlertPresentException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 from openpyxl import Workbook, load_workbook
+from openpyxl.styles import PatternFill
+
+from ratelimit import RateLimiter
+from fastbrowser import create_driver, TimingReport
 
 
 # ==========================================
@@ -80,6 +83,11 @@ SEM_SUBJECT_MAPS = {
 }
 
 
+# Fill for cells whose value changed on upsert (e.g. after revaluation)
+CHANGED_FILL = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+NO_FILL = PatternFill(fill_type=None)
+
+
 # ==========================================
 # EXCEL SETUP
 # ==========================================
@@ -102,19 +110,67 @@ def setup_excel(file_name, sem):
         ws = wb.active
         ws.append(headers)
         wb.save(file_name)
-    return wb, ws
+
+    # USN -> row number, so upserts never scan the sheet
+    usn_rows = {}
+    for row_num, (usn,) in enumerate(ws.iter_rows(min_row=2, max_col=1, values_only=True), 2):
+        if usn:
+            usn_rows[usn] = row_num
+    return wb, ws, usn_rows
+
+
+# ==========================================
+# CELL COMPARISON
+# ==========================================
+def normalize_cell(value):
+    # A reloaded workbook gives back 50 where we wrote 50.0, and marks
+    # may come back as "85" or 85 -- compare numbers as floats.
+    if value is None:
+        return ""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value).strip()
 
 
 # ==========================================
 # SAVE DATA
 # ==========================================
-def save_student(ws, wb, file_name, usn, name, marks):
+def save_student(ws, wb, file_name, usn, name, marks, save=True,
+                 usn_rows=None, highlight=False):
     total = sum(int(m) for m in marks.values() if m != "")
     count = sum(1 for m in marks.values() if m != "")
     percentage = round((total / (count * 100)) * 100, 2) if count > 0 else 0
 
-    ws.append([usn, name] + list(marks.values()) + [total, percentage])
-    wb.save(file_name)
+    values = [usn, name] + list(marks.values()) + [total, percentage]
+
+    if usn_rows is not None and usn in usn_rows:
+        # Upsert: overwrite the existing row in place
+        row_num = usn_rows[usn]
+        for col, value in enumerate(values, 1):
+            cell = ws.cell(row=row_num, column=col)
+            if highlight:
+                changed = normalize_cell(cell.value) != normalize_cell(value)
+                cell.fill = CHANGED_FILL if changed else NO_FILL
+            cell.value = value
+    else:
+        ws.append(values)
+        if usn_rows is not None:
+            usn_rows[usn] = ws.max_row
+
+    if save:
+        wb.save(file_name)
+
+
+# ==========================================
+# ARCHIVE RAW PAGE
+# ==========================================
+def archive_page(archive_dir, usn, html):
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{usn}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return path
 
 
 # ==========================================
@@ -198,35 +254,50 @@ def main():
 
     start_usn = input("Enter Starting USN: ").strip()
 
-    wb, ws = setup_excel(EXCEL_FILE, sem)
+    archive_dir = input("Folder to archive raw result pages (blank to skip): ").strip()
+
+    upsert = input("Update existing USNs in place instead of appending? (y/n): ").strip().lower() == "y"
+    highlight = False
+    if upsert:
+        highlight = input("Highlight changed marks? (y/n): ").strip().lower() == "y"
+
+    wb, ws, usn_rows = setup_excel(EXCEL_FILE, sem)
 
-    options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")
-    driver = webdriver.Chrome(options=options)
+    fast = input("Fast browser mode? (y/n): ").strip().lower() == "y"
+    driver = create_driver(fast)
+    timing = TimingReport(fast)
 
     wait = WebDriverWait(driver, 600)
 
+    # Paces page loads toward results.vtu.ac.in and backs off on errors
+    vtu_limiter = RateLimiter()
+
     current_usn = start_usn
+    on_result_page = False
 
     print(f"\n🚀 VTU Result Scraper Started")
     print(f"📚 Semester: {sem} → {VTU_URL}")
     print(f"📊 Excel: {EXCEL_FILE}")
     print(f"🎯 Starting USN: {start_usn}")
+    if archive_dir:
+        print(f"🗄 Archive: {archive_dir}")
+    if upsert:
+        print(f"♻ Upsert mode: {len(usn_rows)} existing USNs indexed")
     print("Solve CAPTCHA manually → Submit → Auto next USN")
     print("Press Ctrl + C to stop\n")
 
     try:
         while True:
 
-            driver.get(VTU_URL)
-
-            wait.until(EC.presence_of_element_located((By.NAME, "lns")))
+            # In fast mode, go back to the loaded form after a result page
+            timing.timed_load(driver, VTU_URL, vtu_limiter, wait, reuse=fast and on_result_page)
+            on_result_page = False
 
             usn_box = driver.find_element(By.NAME, "lns")
             usn_box.clear()
             usn_box.send_keys(current_usn)
 
-            print(f"➡ Checking: {current_usn}")
+            print(f"➡ Checking: {current_usn} (upstream {vtu_limiter.stats()['rate']} req/s)")
             print("Solve CAPTCHA and click Submit...")
 
             try:
@@ -246,15 +317,23 @@ def main():
                 current_usn = next_usn(current_usn)
                 continue
 
-            html = driver.page_source
+            on_result_page = True
+            # When archiving, pull the full page once (timed and counted) and
+            # parse from it, so archives stay re-parseable in both modes
+            html = timing.timed_extract(driver, full_page=bool(archive_dir))
+            if archive_dir:
+                archive_page(archive_dir, current_usn, html)
             usn, name, marks = extract_result(html, sem)
 
             if usn:
                 print(f"📋 {usn} - {name}")
                 for sub, val in marks.items():
                     print(f"   {sub}: {val}")
-                save_student(ws, wb, EXCEL_FILE, usn, name, marks)
-                print(f"✔ Saved to Excel")
+                updated = upsert and usn in usn_rows
+                save_student(ws, wb, EXCEL_FILE, usn, name, marks,
+                             usn_rows=usn_rows if upsert else None,
+                             highlight=highlight)
+                print("✔ Updated existing row" if updated else "✔ Saved to Excel")
             else:
                 print(f"❌ Could not extract result for {current_usn}")
 
@@ -265,6 +344,7 @@ def main():
 
     finally:
         driver.quit()
+        timing.print_report()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,5 @@
 import os
 import re
-from selenium import webdriver
 from selenium.common.exceptions import UnexpectedAlertPresentException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -8,6 +7,9 @@ from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 from openpyxl import Workbook, load_workbook
 
+from ratelimit import RateLimiter
+from fastbrowser import create_driver, TimingReport
+
 
 # ==========================================
 # SEMESTER URLS
@@ -111,28 +113,32 @@ def main():
     excel_name = input("Enter Excel file name: ").strip() + ".xlsx"
     start_usn = input("Enter Starting USN: ").strip()
 
-    options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")
-    driver = webdriver.Chrome(options=options)
+    fast = input("Fast browser mode? (y/n): ").strip().lower() == "y"
+    driver = create_driver(fast)
+    timing = TimingReport(fast)
 
     wait = WebDriverWait(driver, 600)
 
+    # Paces page loads toward results.vtu.ac.in and backs off on errors
+    vtu_limiter = RateLimiter()
+
     wb = None
     ws = None
     headers_created = False
 
     current_usn = start_usn
+    on_result_page = False
 
     try:
         while True:
 
-            driver.get(VTU_URL)
-
-            wait.until(EC.presence_of_element_located((By.NAME, "lns")))
+            # In fast mode, go back to the loaded form after a result page
+            timing.timed_load(driver, VTU_URL, vtu_limiter, wait, reuse=fast and on_result_page)
+            on_result_page = False
             driver.find_element(By.NAME, "lns").clear()
             driver.find_element(By.NAME, "lns").send_keys(current_usn)
 
-            print(f"Checking: {current_usn}")
+            print(f"Checking: {current_usn} (upstream {vtu_limiter.stats()['rate']} req/s)")
             print("Solve CAPTCHA and click Submit...")
 
             try:
@@ -149,7 +155,8 @@ def main():
                 current_usn = next_usn(current_usn)
                 continue
 
-            html = driver.page_source
+            on_result_page = True
+            html = timing.timed_extract(driver)
             usn, name, subjects, subject_headers = extract_result(html)
 
             if usn:
@@ -183,6 +190,7 @@ def main():
 
     finally:
         driver.quit()
+        timing.print_report()
 
 
 if __name__ == "__main__":
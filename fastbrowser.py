@@ -0,0 +1,215 @@
+import os
+import time
+import statistics
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# ==========================================
+# FAST MODE SETTINGS
+# ==========================================
+FAST_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".vtu_chrome_cache")
+
+# The CAPTCHA is served from vtu_captcha.php, so none of these patterns touch it
+FAST_BLOCKED_URLS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+]
+
+# Smallest element holding both the student table and the marks grid.
+# textContent includes nested cells, so take the innermost matching td
+# rather than an outer layout cell that happens to wrap the label.
+RESULT_HTML_JS = """
+var matches = Array.from(document.querySelectorAll('td')).filter(
+    td => td.textContent.indexOf('University Seat Number') !== -1);
+if (!matches.length) return null;
+var label = matches.find(td => !td.querySelector('td')) || matches[matches.length - 1];
+var marks = document.querySelector('.divTable') || document.querySelector('.divTableRow');
+if (!marks) return document.body.outerHTML;
+var node = label;
+while (node && !node.contains(marks)) node = node.parentElement;
+return (node || document.body).outerHTML;
+"""
+
+# Ask the reused form for a new CAPTCHA, clear the old answer and report
+# back once the image has actually arrived (async script)
+REFRESH_CAPTCHA_JS = """
+var done = arguments[arguments.length - 1];
+var img = Array.from(document.images).find(i => i.src.indexOf('captcha') !== -1);
+if (!img) { done(false); return; }
+img.onload = function() { done(true); };
+img.onerror = function() { done(false); };
+img.src = img.src.split('?')[0] + '?_CAPTCHA&t=' + Date.now();
+var box = document.getElementsByName('captchacode')[0];
+if (box) box.value = '';
+"""
+
+
+# ==========================================
+# DRIVER
+# ==========================================
+def create_driver(fast):
+    options = webdriver.ChromeOptions()
+
+    if not fast:
+        options.add_argument("--start-maximized")
+        return webdriver.Chrome(options=options)
+
+    # Hand control back once the DOM is ready instead of waiting on every asset
+    options.page_load_strategy = "eager"
+    options.add_argument(f"--disk-cache-dir={FAST_CACHE_DIR}")
+    options.add_argument("--window-size=1000,800")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+
+    driver = webdriver.Chrome(options=options)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": FAST_BLOCKED_URLS})
+    return driver
+
+
+# ==========================================
+# LOAD FORM
+# ==========================================
+def load_form(driver, url, limiter, wait, reuse=False):
+    """Get the USN form on screen and wait for its USN box.
+
+    With reuse=True (fast mode, previous USN ended on a result page) go
+    back to the already-loaded form and only swap its CAPTCHA. Falls back
+    to a full load if the form isn't there.
+    """
+    if reuse:
+        def back_to_form():
+            driver.back()
+            WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.NAME, "lns")))
+            if not driver.execute_async_script(REFRESH_CAPTCHA_JS):
+                raise WebDriverException("CAPTCHA refresh failed")
+
+        # Going back and reloading the CAPTCHA still hits VTU, so it is
+        # paced and its outcome fed back like any other upstream call
+        try:
+            limiter.call(back_to_form)
+            return
+        except (TimeoutException, WebDriverException):
+            pass
+
+    limiter.call(driver.get, url)
+    wait.until(EC.presence_of_element_located((By.NAME, "lns")))
+
+
+# ==========================================
+# RESULT HTML
+# ==========================================
+def get_result_html(driver, fast):
+    """Pull back only the result container in fast mode, else the whole page."""
+    if fast:
+        try:
+            html = driver.execute_script(RESULT_HTML_JS)
+            if html:
+                return html
+        except WebDriverException:
+            pass
+    return driver.page_source
+
+
+# ==========================================
+# BROWSER MEMORY
+# ==========================================
+def browser_rss(driver):
+    """Resident memory of every Chrome process (browser, renderers, GPU)
+    started under this driver's chromedriver, or None if unavailable."""
+    if psutil is None:
+        return None
+    try:
+        service = psutil.Process(driver.service.process.pid)
+        total = 0
+        for proc in service.children(recursive=True):
+            try:
+                total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return total
+    except (AttributeError, psutil.Error):
+        return None
+
+
+# ==========================================
+# TIMING REPORT
+# ==========================================
+class TimingReport:
+    """Per-USN browser overhead and memory, excluding time spent solving the CAPTCHA."""
+
+    def __init__(self, fast):
+        self.fast = fast
+        self.load_times = []
+        self.extract_times = []
+        self.html_sizes = []
+        self.browser_rss = []
+        self.heap_sizes = []
+        self.dom_nodes = []
+        self._metrics_enabled = False
+
+    def timed_load(self, *args, **kwargs):
+        start = time.perf_counter()
+        load_form(*args, **kwargs)
+        self.load_times.append(time.perf_counter() - start)
+
+    def timed_extract(self, driver, full_page=False):
+        """Pull the result HTML; full_page=True forces page_source (for archiving)."""
+        start = time.perf_counter()
+        html = driver.page_source if full_page else get_result_html(driver, self.fast)
+        self.extract_times.append(time.perf_counter() - start)
+        self.html_sizes.append(len(html))
+        self.sample_memory(driver)
+        return html
+
+    def sample_memory(self, driver):
+        """Record Chrome's resident memory, plus the page's JS heap and DOM nodes."""
+        rss = browser_rss(driver)
+        if rss is not None:
+            self.browser_rss.append(rss)
+
+        try:
+            if not self._metrics_enabled:
+                driver.execute_cdp_cmd("Performance.enable", {})
+                self._metrics_enabled = True
+            metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        except WebDriverException:
+            return
+        values = {m["name"]: m["value"] for m in metrics}
+        if "JSHeapUsedSize" in values:
+            self.heap_sizes.append(values["JSHeapUsedSize"])
+        if "Nodes" in values:
+            self.dom_nodes.append(values["Nodes"])
+
+    def print_report(self):
+        if not self.load_times:
+            return
+        mode = "fast" if self.fast else "standard"
+        print(f"\n⏱ Browser timing ({mode} mode, {len(self.load_times)} forms loaded)")
+        print(f"   Form load   mean {statistics.mean(self.load_times):.2f}s"
+              f"  median {statistics.median(self.load_times):.2f}s")
+        if self.extract_times:
+            print(f"   Extraction  mean {statistics.mean(self.extract_times) * 1000:.0f}ms"
+                  f"  median {statistics.median(self.extract_times) * 1000:.0f}ms")
+            print(f"   HTML pulled mean {statistics.mean(self.html_sizes) / 1024:.1f} KB per USN")
+        if self.browser_rss:
+            print(f"   Chrome RSS  mean {statistics.mean(self.browser_rss) / 1024 / 1024:.0f} MB"
+                  f"  peak {max(self.browser_rss) / 1024 / 1024:.0f} MB")
+        elif psutil is None:
+            print("   Chrome RSS  unavailable (pip install psutil)")
+        if self.heap_sizes:
+            print(f"   JS heap     mean {statistics.mean(self.heap_sizes) / 1024 / 1024:.1f} MB"
+                  f"  peak {max(self.heap_sizes) / 1024 / 1024:.1f} MB")
+        if self.dom_nodes:
+            print(f"   DOM nodes   mean {statistics.mean(self.dom_nodes):.0f}")
+        print("   Run once in each mode to compare before/after.")
@@ -0,0 +1,106 @@
+import os
+import glob
+import time
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from capman import SEM_SUBJECT_MAPS, extract_result, setup_excel, save_student
+
+
+# ==========================================
+# PARSE ONE ARCHIVED PAGE (runs in a worker)
+# ==========================================
+def parse_page(path, sem):
+    # Read inside the worker so only the path and the parsed row
+    # cross the process boundary, never the full HTML.
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        usn, name, marks = extract_result(html, sem)
+    except Exception:
+        return path, None, None, None
+    return path, usn, name, marks
+
+
+# ==========================================
+# CHUNK SIZE
+# ==========================================
+def pick_chunksize(total, workers):
+    # ~4 chunks per worker keeps every core busy without paying
+    # one IPC round trip per page.
+    return max(1, total // (workers * 4))
+
+
+# ==========================================
+# MAIN
+# ==========================================
+def main():
+
+    print("\n🔁 VTU Bulk Re-parse - Archived Result Pages")
+    print("=" * 50)
+
+    sem = input("Enter Semester (1-5): ").strip()
+
+    if sem not in SEM_SUBJECT_MAPS:
+        print("❌ Invalid semester!")
+        return
+
+    archive_dir = input("Archive folder with saved result pages: ").strip()
+    pages = sorted(glob.glob(os.path.join(archive_dir, "*.html")))
+
+    if not pages:
+        print(f"❌ No .html pages found in {archive_dir}")
+        return
+
+    default_name = f"VTU_Sem{sem}_Reparsed"
+    excel_name = input(f"Enter Excel file name (default: {default_name}): ").strip()
+    if not excel_name:
+        excel_name = default_name
+    EXCEL_FILE = excel_name + ".xlsx"
+
+    if os.path.exists(EXCEL_FILE):
+        overwrite = input(f"⚠ {EXCEL_FILE} exists. Overwrite? (y/n): ").strip().lower()
+        if overwrite != "y":
+            print("🛑 Aborted")
+            return
+        os.remove(EXCEL_FILE)
+
+    workers = os.cpu_count() or 1
+    chunksize = pick_chunksize(len(pages), workers)
+
+    print(f"\n🚀 Re-parsing {len(pages)} pages")
+    print(f"📚 Semester: {sem}")
+    print(f"📊 Excel: {EXCEL_FILE}")
+    print(f"⚙ Workers: {workers} (chunk size {chunksize})\n")
+
+    wb, ws, _ = setup_excel(EXCEL_FILE, sem)
+
+    saved = 0
+    failed = []
+    start = time.perf_counter()
+
+    # executor.map yields in input order, so rows land in USN order
+    # even though pages are parsed out of order across workers.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path, usn, name, marks in executor.map(
+            partial(parse_page, sem=sem), pages, chunksize=chunksize
+        ):
+            if usn:
+                save_student(ws, wb, EXCEL_FILE, usn, name, marks, save=False)
+                saved += 1
+            else:
+                failed.append(path)
+
+    wb.save(EXCEL_FILE)
+    elapsed = time.perf_counter() - start
+
+    print(f"✔ Saved {saved} students to {EXCEL_FILE} in {elapsed:.1f}s")
+
+    if failed:
+        print(f"❌ {len(failed)} pages no longer parse:")
+        for path in failed:
+            print(f"   {path}")
+
+
+if __name__ == "__main__":
+    main()